@@ -1,6 +1,5 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
@@ -13,10 +12,15 @@ st.markdown("*Built by Pradnya Bapat - Real-time currency exchange rate trends a
 st.markdown("---")
 
 # Generate sample data (simulating real currency data)
-@st.cache_data
+# Shared across sessions without copying: treat the frame as read-only and
+# only slice/copy it downstream, never mutate it in place
+@st.cache_resource
 def load_data():
+    # Fixed seed so the simulated data is identical across runs and deploys
+    rng = np.random.default_rng(42)
+    
     # Create 1 year of daily data
-    dates = pd.date_range(start='2023-01-01', end='2024-01-01', freq='D')
+    dates = np.arange(np.datetime64('2023-01-01'), np.datetime64('2024-01-02'), dtype='datetime64[D]')
     
     # Currency pairs with realistic base rates
     pairs = {
@@ -28,25 +32,61 @@ def load_data():
         'GBP/INR': {'base': 110.0, 'volatility': 1.2}
     }
     
-    data = []
-    for i, date in enumerate(dates):
-        for pair_name, config in pairs.items():
-            # Create realistic fluctuations
-            trend = np.sin(i * 0.02) * 0.05  # Seasonal trend
-            random_change = np.random.normal(0, config['volatility'])
-            rate = config['base'] * (1 + trend + random_change)
-            
-            data.append({
-                'Date': date,
-                'Currency_Pair': pair_name,
-                'Exchange_Rate': round(rate, 4),
-                'Volume': np.random.randint(1000000, 8000000)
-            })
+    pair_names = list(pairs.keys())
+    bases = np.array([config['base'] for config in pairs.values()])
+    volatilities = np.array([config['volatility'] for config in pairs.values()])
+    
+    n, p = len(dates), len(pairs)
+    i = np.arange(n)
+    trend = np.sin(i * 0.02) * 0.05  # Seasonal trend
     
-    return pd.DataFrame(data)
+    # Create realistic fluctuations as a (date, pair) matrix via broadcasting
+    random_change = rng.normal(0, volatilities, (n, p))
+    rates = bases * (1 + trend[:, None] + random_change)
+    volumes = rng.integers(1000000, 8000000, (n, p), dtype=np.int32)
+    
+    # Flatten row-major into long format: dates repeat, pairs tile
+    df = pd.DataFrame({
+        'Date': np.repeat(dates, p),
+        'Currency_Pair': pd.Categorical(np.tile(pair_names, n), categories=pair_names),
+        'Exchange_Rate': np.round(rates, 4).ravel().astype('float32'),
+        'Volume': volumes.ravel()
+    })
+    return df.set_index('Date'), tuple(pair_names)
+
+# Restrict the date-indexed data to a selection (range slice + categorical isin)
+def filter_data(data, currencies, start_date):
+    sub = data.loc[start_date:]
+    return sub[sub['Currency_Pair'].isin(currencies)]
+
+# Summary statistics for the current selection, memoized across reruns
+@st.cache_data
+def compute_stats(currencies_tuple, start_date):
+    data = filter_data(load_data()[0], currencies_tuple, start_date)
+    
+    # Pivot once into a Date x Currency_Pair matrix that powers every aggregate
+    mat = data.pivot(columns='Currency_Pair', values='Exchange_Rate').dropna(axis=1, how='all')
+    
+    per_currency_stats_df = pd.DataFrame({
+        'min': mat.min(),
+        'max': mat.max(),
+        'mean': mat.mean(),
+        'std': mat.std(),
+        'last': mat.iloc[-1]
+    })
+    peak_low_df = per_currency_stats_df[['min', 'max']].reset_index()
+    
+    # Equal weight basket calculation
+    basket_df = mat.mean(axis=1).rename('Basket_Value').reset_index()
+    
+    vol_series = per_currency_stats_df['std']
+    
+    # Headline metrics fused into a single pass over both columns
+    summary = data.agg({'Exchange_Rate': ['mean', 'std'], 'Volume': 'sum'})
+    return peak_low_df, basket_df, per_currency_stats_df, vol_series, summary
 
 # Load data
-df = load_data()
+df, pair_names = load_data()
 
 # Sidebar filters
 st.sidebar.header("🔧 Dashboard Controls")
@@ -55,7 +95,7 @@ st.sidebar.markdown("*Filter and customize your analysis*")
 # Currency selection
 currencies = st.sidebar.multiselect(
     "Select Currency Pairs:",
-    options=df['Currency_Pair'].unique(),
+    options=pair_names,
     default=['USD/EUR', 'USD/GBP', 'USD/INR'],
     help="Choose one or more currency pairs to analyze"
 )
@@ -68,7 +108,7 @@ period = st.sidebar.selectbox(
 )
 
 # Calculate date range
-today = df['Date'].max()
+today = df.index.max()
 if period == 'Last 30 Days':
     start_date = today - timedelta(days=30)
 elif period == 'Last 90 Days':
@@ -76,18 +116,22 @@ elif period == 'Last 90 Days':
 elif period == 'Last 6 Months':
     start_date = today - timedelta(days=180)
 else:
-    start_date = df['Date'].min()
+    start_date = df.index.min()
 
 # Filter data
-filtered_data = df[
-    (df['Currency_Pair'].isin(currencies)) & 
-    (df['Date'] >= start_date)
-]
+filtered_data = filter_data(df, currencies, start_date).reset_index()
 
 if filtered_data.empty:
     st.warning("⚠️ No data available for selected filters. Please adjust your selection.")
     st.stop()
 
+peak_low_df, basket_data, per_currency_stats, vol_series, summary = compute_stats(
+    tuple(sorted(currencies)), start_date
+)
+avg_rate = summary.loc['mean', 'Exchange_Rate']
+volatility = summary.loc['std', 'Exchange_Rate']
+total_volume = summary.loc['sum', 'Volume'] / 1000000
+
 # Key Metrics Row
 st.subheader("📊 Key Metrics Dashboard")
 col1, col2, col3, col4 = st.columns(4)
@@ -100,7 +144,6 @@ with col1:
     )
 
 with col2:
-    avg_rate = filtered_data['Exchange_Rate'].mean()
     st.metric(
         label="📊 Average Rate",
         value=f"{avg_rate:.3f}",
@@ -108,7 +151,6 @@ with col2:
     )
 
 with col3:
-    total_volume = filtered_data['Volume'].sum() / 1000000
     st.metric(
         label="💰 Total Volume",
         value=f"{total_volume:.1f}M",
@@ -116,7 +158,6 @@ with col3:
     )
 
 with col4:
-    volatility = filtered_data['Exchange_Rate'].std()
     risk = "High" if volatility > 5 else "Medium" if volatility > 1 else "Low"
     color = "normal" if risk == "Low" else "inverse"
     st.metric(
@@ -128,51 +169,54 @@ with col4:
 st.markdown("---")
 
 # Main trend chart
-st.subheader("📈 Exchange Rate Trends")
-st.markdown(f"*Showing trends for {period.lower()} across selected currency pairs*")
-
-fig_line = px.line(
-    filtered_data,
-    x='Date',
-    y='Exchange_Rate',
-    color='Currency_Pair',
-    title=f"Currency Exchange Rate Trends - {period}",
-    height=500,
-    labels={'Exchange_Rate': 'Exchange Rate', 'Date': 'Date'}
-)
-
-fig_line.update_layout(
-    xaxis_title="Date",
-    yaxis_title="Exchange Rate",
-    hovermode='x unified',
-    legend=dict(
-        orientation="h",
-        yanchor="bottom",
-        y=1.02,
-        xanchor="right",
-        x=1
+@st.fragment
+def render_trends(filtered_data, period):
+    st.subheader("📈 Exchange Rate Trends")
+    st.markdown(f"*Showing trends for {period.lower()} across selected currency pairs*")
+
+    fig_line = go.Figure()
+    # One WebGL trace per pair, built directly to skip plotly express overhead
+    for name, grp in filtered_data.groupby('Currency_Pair', observed=True):
+        fig_line.add_trace(go.Scattergl(
+            x=grp['Date'],
+            y=grp['Exchange_Rate'],
+            mode='lines',
+            name=name
+        ))
+
+    fig_line.update_layout(
+        title=f"Currency Exchange Rate Trends - {period}",
+        height=500,
+        xaxis_title="Date",
+        yaxis_title="Exchange Rate",
+        hovermode='x unified',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
     )
-)
 
-st.plotly_chart(fig_line, use_container_width=True)
+    st.plotly_chart(fig_line, use_container_width=True)
 
-# Two column layout for additional analysis
-col1, col2 = st.columns(2)
+render_trends(filtered_data, period)
 
 # Peak vs Low rates
-with col1:
+@st.fragment
+def render_peak_low(stats):
     st.subheader("📊 Peak vs Lowest Rates")
     st.markdown("*Compare highest and lowest exchange rates*")
     
-    stats = filtered_data.groupby('Currency_Pair')['Exchange_Rate'].agg(['min', 'max']).reset_index()
-    
     fig_bar = go.Figure()
     fig_bar.add_trace(go.Bar(
         name='Lowest Rate',
         x=stats['Currency_Pair'],
         y=stats['min'],
         marker_color='#ff6b6b',
-        text=stats['min'].round(4),
+        text=stats['min'].map('{:.4f}'.format),
+        texttemplate='%{text}',
         textposition='auto'
     ))
     fig_bar.add_trace(go.Bar(
@@ -180,7 +224,8 @@ with col1:
         x=stats['Currency_Pair'],
         y=stats['max'],
         marker_color='#4ecdc4',
-        text=stats['max'].round(4),
+        text=stats['max'].map('{:.4f}'.format),
+        texttemplate='%{text}',
         textposition='auto'
     ))
     
@@ -195,88 +240,110 @@ with col1:
     st.plotly_chart(fig_bar, use_container_width=True)
 
 # Currency basket
-with col2:
+@st.fragment
+def render_basket(basket_data):
     st.subheader("🎯 Currency Basket Analysis")
     st.markdown("*Equal-weighted portfolio performance*")
     
-    # Equal weight basket calculation
-    basket_data = filtered_data.groupby('Date')['Exchange_Rate'].mean().reset_index()
-    basket_data.columns = ['Date', 'Basket_Value']
+    fig_area = go.Figure()
+    fig_area.add_trace(go.Scatter(
+        x=basket_data['Date'],
+        y=basket_data['Basket_Value'],
+        mode='lines',
+        name='Basket Value',
+        fill='tozeroy',
+        fillcolor='rgba(74, 144, 226, 0.3)'
+    ))
     
-    fig_area = px.area(
-        basket_data,
-        x='Date',
-        y='Basket_Value',
+    fig_area.update_layout(
         title="Weighted Currency Basket Value",
         height=400,
-        labels={'Basket_Value': 'Basket Value', 'Date': 'Date'}
+        xaxis_title="Date",
+        yaxis_title="Basket Value"
     )
-    
-    fig_area.update_traces(fill='tonexty', fillcolor='rgba(74, 144, 226, 0.3)')
     st.plotly_chart(fig_area, use_container_width=True)
 
+# Two column layout for additional analysis
+col1, col2 = st.columns(2)
+
+with col1:
+    render_peak_low(peak_low_df)
+
+with col2:
+    render_basket(basket_data)
+
 # Statistics table
-st.subheader("📋 Detailed Currency Statistics")
-st.markdown("*Comprehensive analysis of selected currency pairs*")
-
-stats_data = []
-for currency in currencies:
-    curr_data = filtered_data[filtered_data['Currency_Pair'] == currency]['Exchange_Rate']
-    if len(curr_data) > 0:
-        vol = curr_data.std()
-        risk_level = "🔴 High" if vol > 5 else "🟡 Medium" if vol > 1 else "🟢 Low"
-        
-        stats_data.append({
-            'Currency Pair': currency,
-            'Current Rate': f"{curr_data.iloc[-1]:.4f}",
-            'Peak Rate': f"{curr_data.max():.4f}",
-            'Lowest Rate': f"{curr_data.min():.4f}",
-            'Average Rate': f"{curr_data.mean():.4f}",
-            'Volatility': f"{vol:.3f}",
-            'Risk Level': risk_level
-        })
-
-stats_df = pd.DataFrame(stats_data)
-st.dataframe(stats_df, use_container_width=True, hide_index=True)
+@st.fragment
+def render_stats_table(currencies, per_currency_stats):
+    st.subheader("📋 Detailed Currency Statistics")
+    st.markdown("*Comprehensive analysis of selected currency pairs*")
+
+    # Keep the sidebar selection order, dropping pairs with no data
+    agg = per_currency_stats.reindex(currencies).dropna(subset=['last'])
+    
+    stats_df = pd.DataFrame({
+        'Currency Pair': agg.index,
+        'Current Rate': agg['last'].map('{:.4f}'.format),
+        'Peak Rate': agg['max'].map('{:.4f}'.format),
+        'Lowest Rate': agg['min'].map('{:.4f}'.format),
+        'Average Rate': agg['mean'].map('{:.4f}'.format),
+        'Volatility': agg['std'].map('{:.3f}'.format),
+        'Risk Level': np.select(
+            [agg['std'] > 5, agg['std'] > 1],
+            ['🔴 High', '🟡 Medium'],
+            default='🟢 Low'
+        )
+    })
+    st.dataframe(stats_df, use_container_width=True, hide_index=True)
+
+render_stats_table(currencies, per_currency_stats)
 
 # Risk Assessment Section
-st.subheader("⚠️ Volatility-Based Risk Assessment System")
-st.markdown("*Categorization based on exchange rate standard deviation*")
-
-risk_col1, risk_col2, risk_col3 = st.columns(3)
-
-with risk_col1:
-    st.success("**🟢 Low Risk Portfolio**")
-    st.markdown("*Volatility < 1.0 - Stable currencies*")
-    low_risk = [curr for curr in currencies if filtered_data[filtered_data['Currency_Pair'] == curr]['Exchange_Rate'].std() < 1.0]
-    if low_risk:
-        for curr in low_risk:
-            vol = filtered_data[filtered_data['Currency_Pair'] == curr]['Exchange_Rate'].std()
-            st.write(f"• {curr} (σ: {vol:.3f})")
-    else:
-        st.write("• No currencies in this category")
-
-with risk_col2:
-    st.warning("**🟡 Medium Risk Portfolio**")
-    st.markdown("*1.0 ≤ Volatility < 5.0 - Moderate risk*")
-    med_risk = [curr for curr in currencies if 1.0 <= filtered_data[filtered_data['Currency_Pair'] == curr]['Exchange_Rate'].std() < 5.0]
-    if med_risk:
-        for curr in med_risk:
-            vol = filtered_data[filtered_data['Currency_Pair'] == curr]['Exchange_Rate'].std()
-            st.write(f"• {curr} (σ: {vol:.3f})")
-    else:
-        st.write("• No currencies in this category")
-
-with risk_col3:
-    st.error("**🔴 High Risk Portfolio**")
-    st.markdown("*Volatility ≥ 5.0 - High volatility*")
-    high_risk = [curr for curr in currencies if filtered_data[filtered_data['Currency_Pair'] == curr]['Exchange_Rate'].std() >= 5.0]
-    if high_risk:
-        for curr in high_risk:
-            vol = filtered_data[filtered_data['Currency_Pair'] == curr]['Exchange_Rate'].std()
-            st.write(f"• {curr} (σ: {vol:.3f})")
-    else:
-        st.write("• No currencies in this category")
+@st.fragment
+def render_risk_assessment(currencies, vol_series):
+    st.subheader("⚠️ Volatility-Based Risk Assessment System")
+    st.markdown("*Categorization based on exchange rate standard deviation*")
+
+    # Bucketize every selected pair's volatility in one pass
+    vols = vol_series.reindex(currencies)
+    buckets = pd.cut(vols, [-np.inf, 1.0, 5.0, np.inf], labels=['Low', 'Medium', 'High'], right=False)
+    low_risk = vols.index[buckets == 'Low'].tolist()
+    med_risk = vols.index[buckets == 'Medium'].tolist()
+    high_risk = vols.index[buckets == 'High'].tolist()
+
+    risk_col1, risk_col2, risk_col3 = st.columns(3)
+
+    with risk_col1:
+        st.success("**🟢 Low Risk Portfolio**")
+        st.markdown("*Volatility < 1.0 - Stable currencies*")
+        if low_risk:
+            for curr in low_risk:
+                vol = vols[curr]
+                st.write(f"• {curr} (σ: {vol:.3f})")
+        else:
+            st.write("• No currencies in this category")
+
+    with risk_col2:
+        st.warning("**🟡 Medium Risk Portfolio**")
+        st.markdown("*1.0 ≤ Volatility < 5.0 - Moderate risk*")
+        if med_risk:
+            for curr in med_risk:
+                vol = vols[curr]
+                st.write(f"• {curr} (σ: {vol:.3f})")
+        else:
+            st.write("• No currencies in this category")
+
+    with risk_col3:
+        st.error("**🔴 High Risk Portfolio**")
+        st.markdown("*Volatility ≥ 5.0 - High volatility*")
+        if high_risk:
+            for curr in high_risk:
+                vol = vols[curr]
+                st.write(f"• {curr} (σ: {vol:.3f})")
+        else:
+            st.write("• No currencies in this category")
+
+render_risk_assessment(currencies, vol_series)
 
 # Footer with additional information
 st.markdown("---")